@@ -0,0 +1,53 @@
+"""Generate scorer.pyx with the logistic regression weights baked in and compile it.
+
+Run this again whenever heart_disease_model.pkl is retrained. main.py only
+uses the compiled module while its weights match the loaded model.
+
+    python build_scorer.py
+"""
+import subprocess
+import sys
+
+import main
+
+TEMPLATE = '''# Generated by build_scorer.py from {path}. Do not edit.
+from libc.math cimport exp
+
+W = ({weights},)
+B = {bias!r}
+
+{constants}
+
+def score({args}):
+    """Probability of heart disease for one patient, features in FEATURES order"""
+    cdef double z = {dot} + B_
+    return 1.0 / (1.0 + exp(-z))
+'''
+
+def generate(path="heart_disease_model.pkl"):
+    """Return the source of scorer.pyx for the model at path"""
+    main.load_model(path)
+    if main._W is None:
+        raise ValueError(f"{path} is not a binary logistic regression over FEATURES")
+    weights = [float(w) for w in main._W]
+    return TEMPLATE.format(
+        path=path,
+        weights=", ".join(repr(w) for w in weights),
+        bias=main._B,
+        constants="\n".join(
+            [f"cdef double W{j} = {w!r}" for j, w in enumerate(weights)]
+            + [f"cdef double B_ = {main._B!r}"]
+        ),
+        args=", ".join(f"double x{j}" for j in range(len(weights))),
+        dot=" + ".join(f"W{j} * x{j}" for j in range(len(weights)))
+    )
+
+if __name__ == "__main__":
+    try:
+        source = generate()
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    with open("scorer.pyx", "w") as f:
+        f.write(source)
+    subprocess.run([sys.executable, "-m", "Cython.Build.Cythonize", "-i", "scorer.pyx"], check=True)
+    print("Built scorer from heart_disease_model.pkl")
@@ -1,27 +1,350 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import pandas as pd
 import joblib
+import msgspec
+from sklearn.linear_model import LogisticRegression
 import numpy as np
+from numba import njit
+import math
 from typing import List, Optional
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from contextlib import asynccontextmanager
+import asyncio
+import anyio
+import operator
+import orjson
+import os
+import re
+import threading
+import time
 import uvicorn
+import warnings
+
+try:
+    import scorer  # generated and compiled by build_scorer.py
+except ImportError:
+    scorer = None
+
+# Feature order expected by the model
+FEATURES = (
+    "age", "sex", "cp", "trestbps", "chol", "fbs", "restecg",
+    "thalach", "exang", "oldpeak", "slope", "ca", "thal"
+)
+
+# Loaded in each worker process at startup, see load_model
+model = None
+
+# Weights for the hand-coded logistic regression scorer. Any other kind of
+# model goes through ONNX Runtime, or sklearn if it cannot be converted.
+_W = None
+_B = 0.0
+_onnx_session = None
+_scalar_scorer = None
+
+# Column indices that put FEATURES-ordered rows into the order the model was
+# fitted on, or None when the two already agree
+_COLUMNS = None
+
+# The model is fed plain ndarrays, so keep sklearn from warning on every call
+# when it was fitted on a DataFrame. Column order is handled by _COLUMNS.
+warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+
+def load_model(path="heart_disease_model.pkl"):
+    """Load the trained model and pick out the logistic regression weights"""
+    global model, _W, _B, _onnx_session, _scalar_scorer, _COLUMNS
+    _W, _B, _onnx_session, _scalar_scorer, _COLUMNS = None, 0.0, None, None, None
+    try:
+        # The model's arrays are memory-mapped read-only, so worker processes
+        # share them through the page cache. They must not be modified in place.
+        model = joblib.load(path, mmap_mode="r")
+    except FileNotFoundError:
+        print("Warning: Model file not found. Please ensure 'heart_disease_model.pkl' is in the current directory.")
+        model = None
+        return
+
+    # A model fitted on a DataFrame may have its columns in another order
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None and tuple(names) != FEATURES:
+        if sorted(names) != sorted(FEATURES):
+            print(f"Error: Model was fitted on columns {list(names)}, expected {list(FEATURES)}. Not serving it.")
+            model = None
+            return
+        _COLUMNS = np.array([FEATURES.index(name) for name in names])
+
+    if (isinstance(model, LogisticRegression)
+            and model.coef_.shape == (1, len(FEATURES))
+            and list(model.classes_) == [0, 1]):
+        coef = model.coef_.ravel()
+        if _COLUMNS is not None:
+            coef = coef[np.argsort(_COLUMNS)]  # back into FEATURES order
+        _W = np.ascontiguousarray(coef, dtype=np.float64)
+        _B = float(model.intercept_[0])
+        # Only use the compiled scorer if it was generated from these weights
+        if scorer is not None and scorer.B == _B and np.array_equal(scorer.W, _W):
+            _scalar_scorer = scorer
+    else:
+        _onnx_session = _build_onnx_session()
+
+# Documented feature ranges (see README), used to draw the ONNX check sample
+FEATURE_RANGES = (
+    (29, 77), (0, 1), (0, 3), (94, 200), (126, 564), (0, 1), (0, 2),
+    (71, 202), (0, 1), (0.0, 6.2), (0, 2), (0, 4), (0, 3)
+)
+ONNX_TOLERANCE = 1e-9  # max probability difference from sklearn on the sample
+
+def _check_sample(n=4096):
+    """Fixed random patients within FEATURE_RANGES, oldpeak to 1 decimal and the rest whole"""
+    rng = np.random.default_rng(0)
+    lo, hi = np.array(FEATURE_RANGES, dtype=np.float64).T
+    X = np.round(rng.uniform(lo, hi, size=(n, len(FEATURES))))
+    X[:, 9] = np.round(rng.uniform(lo[9], hi[9], size=n), 1)  # oldpeak
+    return X
+
+def _model_input(X):
+    """Reorder the columns of a FEATURES-ordered X to match the model"""
+    return X if _COLUMNS is None else X[:, _COLUMNS]
+
+def _build_onnx_session():
+    """Convert the model to ONNX and open a CPU session, or None if it cannot be used"""
+    X = _model_input(_check_sample())
+    try:
+        # Imported here, only models that are not plain logistic regressions need them
+        import onnxruntime as ort
+        from skl2onnx import convert_sklearn
+        from skl2onnx.common.data_types import DoubleTensorType
+
+        # float64 throughout, like the sklearn path it replaces
+        onx = convert_sklearn(
+            model,
+            initial_types=[("input", DoubleTensorType([None, len(FEATURES)]))],
+            options={id(model): {"zipmap": False}}  # probabilities as a plain tensor
+        )
+        so = ort.SessionOptions()
+        so.intra_op_num_threads = 1  # parallelism comes from the batcher and threadpool
+        session = ort.InferenceSession(onx.SerializeToString(), sess_options=so, providers=["CPUExecutionProvider"])
+        labels, probabilities = session.run(None, {"input": X})
+    except Exception as e:
+        print(f"Warning: Could not run model with ONNX Runtime, using sklearn instead: {e}")
+        return None
+
+    # Only switch over if the ONNX model gives the same labels and confidence
+    # codes as sklearn on every row, ties at the thresholds included
+    expected = model.predict_proba(X)[:, 1]
+    if (np.abs(probabilities[:, 1] - expected).max() > ONNX_TOLERANCE
+            or not np.array_equal(labels, model.predict(X))
+            or not np.array_equal(_confidence_codes(probabilities[:, 1]), _confidence_codes(expected))):
+        print("Warning: ONNX model does not match sklearn, using sklearn instead")
+        return None
+    return session
+
+# Confidence codes returned by the scorers, indexed into CONFIDENCE_LABELS
+CONFIDENCE_LABELS = ("Low", "Medium", "High")
+_CONFIDENCE_ARRAY = np.array(CONFIDENCE_LABELS, dtype=object)  # for batch lookups
+
+def _confidence_codes(probabilities):
+    """Confidence codes for an array of probabilities, as in _score_kernel"""
+    return np.where(probabilities > 0.8, 2, np.where(probabilities > 0.6, 1, 0))
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _score_kernel(X, W, b):
+    """Logistic regression over the rows of X, with confidence codes"""
+    n = X.shape[0]
+    out_pred = np.empty(n, np.int8)
+    out_p = np.empty(n)
+    out_c = np.empty(n, np.int8)
+    for i in range(n):
+        z = b
+        for j in range(X.shape[1]):
+            z += X[i, j] * W[j]
+        p = 1.0 / (1.0 + math.exp(-z))
+        out_p[i] = p
+        # Same decision rule as LogisticRegression.predict (decision function > 0)
+        out_pred[i] = 1 if p > 0.5 else 0
+        out_c[i] = 2 if p > 0.8 else 1 if p > 0.6 else 0
+    return out_pred, out_p, out_c
+
+def _score(X):
+    """Return predictions, heart disease probabilities and confidence codes for the rows of X"""
+    if _W is None:
+        X = _model_input(X)
+        if _onnx_session is not None:
+            predictions, probabilities = _onnx_session.run(None, {"input": np.ascontiguousarray(X)})
+            probabilities = probabilities[:, 1]
+        else:
+            predictions = model.predict(X)
+            probabilities = model.predict_proba(X)[:, 1]
+        return predictions, probabilities, _confidence_codes(probabilities)
+    return _score_kernel(X, _W, _B)
+
+def _features_key(input_data):
+    """Return the input features as a tuple in FEATURES order, oldpeak rounded to 1 decimal"""
+    return (
+        input_data.age,
+        input_data.sex,
+        input_data.cp,
+        input_data.trestbps,
+        input_data.chol,
+        input_data.fbs,
+        input_data.restecg,
+        input_data.thalach,
+        input_data.exang,
+        round(input_data.oldpeak, 1),
+        input_data.slope,
+        input_data.ca,
+        input_data.thal,
+    )
+
+# LRU cache of /predict results keyed on the feature tuple, one per worker
+# process. Only touched from the event loop, so no locking is needed.
+CACHE_SIZE = 100_000
+
+_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_cache_hits = 0
+_cache_misses = 0
+
+def _cache_get(key):
+    """Return the cached result for key, or None"""
+    global _cache_hits, _cache_misses
+    result = _cache.get(key)
+    if result is None:
+        _cache_misses += 1
+    else:
+        _cache_hits += 1
+        _cache.move_to_end(key)
+    return result
+
+def _cache_put(key, result):
+    """Store a result, evicting the least recently used entry when full"""
+    _cache[key] = result
+    _cache.move_to_end(key)
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+
+_FIELD_GETTERS = [operator.attrgetter(f) for f in FEATURES]
+
+# Per-thread scratch matrix for batch features, grown as needed up to
+# SCRATCH_MAX_ROWS so one huge batch does not pin memory in every thread
+SCRATCH_MAX_ROWS = 4096
+
+_scratch = threading.local()
+
+def _scratch_matrix(n):
+    """Return an n x 13 matrix, reusing the calling thread's scratch buffer when it fits"""
+    if n > SCRATCH_MAX_ROWS:
+        return np.empty((n, len(FEATURES)), dtype=np.float64)
+    buffer = getattr(_scratch, "buffer", None)
+    if buffer is None or buffer.shape[0] < n:
+        buffer = _scratch.buffer = np.empty((max(n, MAX_BATCH), len(FEATURES)), dtype=np.float64)
+    return buffer[:n]
+
+def _features_matrix(input_data):
+    """Build the n x 13 feature matrix column by column from a list of inputs"""
+    # May be the thread's scratch buffer, valid until the next call on this thread
+    n = len(input_data)
+    X = _scratch_matrix(n)
+    for j, getter in enumerate(_FIELD_GETTERS):
+        X[:, j] = np.fromiter((getter(d) for d in input_data), dtype=np.float64, count=n)
+    return X
+
+# Server processes; each loads the model at startup, sharing its memory-mapped arrays
+WORKERS = os.cpu_count() or 1
+
+# Worker threads available to sync endpoints and offloaded scoring
+THREADPOOL_SIZE = 64
+
+# Micro-batching: concurrent /predict calls are coalesced into one model call
+MAX_BATCH = 64  # max requests scored together
+MAX_WAIT_MS = 5  # how long to wait for a batch to fill up
+
+_queue: Optional[asyncio.Queue] = None
+_worker: Optional[asyncio.Task] = None
+
+def _fail_pending(items, exc):
+    """Set exc on every future in items that has not been resolved yet"""
+    for _, future in items:
+        if not future.done():  # the caller may have gone away
+            future.set_exception(exc)
+
+async def _batch_worker():
+    """Drain queued /predict requests and score them in a single call"""
+    loop = asyncio.get_running_loop()
+    buffer = np.empty((MAX_BATCH, len(FEATURES)), dtype=np.float64)
+    while True:
+        items = [await _queue.get()]
+        try:
+            deadline = loop.time() + MAX_WAIT_MS / 1000
+            while len(items) < MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(_queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            if len(items) == 1 and _scalar_scorer is not None:
+                # A lone request is cheaper to score inline than through the threadpool
+                p = _scalar_scorer.score(*items[0][0])
+                results = [(1 if p > 0.5 else 0, p, 2 if p > 0.8 else 1 if p > 0.6 else 0)]
+            else:
+                X = buffer[:len(items)]
+                for i, (key, _) in enumerate(items):
+                    X[i] = key
+                # Score off the event loop so queued requests keep flowing in
+                predictions, probabilities, confidences = await run_in_threadpool(_score, X)
+                results = [
+                    (int(predictions[i]), float(probabilities[i]), int(confidences[i]))
+                    for i in range(len(items))
+                ]
+
+            for (key, future), result in zip(items, results):
+                _cache_put(key, result)
+                if not future.done():  # the caller may have gone away
+                    future.set_result(result)
+        except asyncio.CancelledError:
+            _fail_pending(items, RuntimeError("Server is shutting down"))
+            raise
+        except Exception as e:
+            _fail_pending(items, e)
+
+def _on_worker_done(task):
+    """Report a batch worker that stopped for any reason other than shutdown"""
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Error: Batch worker stopped, /predict is unavailable: {task.exception()!r}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the model and start the batch worker for the lifetime of the app"""
+    global _queue, _worker
+    load_model()
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if _W is not None:
+        _score(np.zeros((1, len(FEATURES))))  # compile the kernel before serving
+    _queue = asyncio.Queue()
+    _worker = asyncio.create_task(_batch_worker())
+    _worker.add_done_callback(_on_worker_done)
+    yield
+    _worker.cancel()
+    await asyncio.gather(_worker, return_exceptions=True)
+    # Fail requests that were queued but never picked up
+    while not _queue.empty():
+        _fail_pending([_queue.get_nowait()], RuntimeError("Server is shutting down"))
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Heart Disease Prediction API",
     description="A machine learning API for predicting heart disease based on patient features",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Load the trained model
-try:
-    model = joblib.load("heart_disease_model.pkl")
-except FileNotFoundError:
-    print("Warning: Model file not found. Please ensure 'heart_disease_model.pkl' is in the current directory.")
-    model = None
-
 # Define the input data model
-class HeartDiseaseInput(BaseModel):
+class HeartDiseaseInput(msgspec.Struct):
     age: int
     sex: int  # 0 = female, 1 = male
     cp: int  # chest pain type (0-3)
@@ -36,6 +359,42 @@ class HeartDiseaseInput(BaseModel):
     ca: int  # number of major vessels colored by fluoroscopy (0-4)
     thal: int  # thalassemia (0-3)
 
+# Request bodies are decoded and validated by msgspec in a single pass.
+# strict=False accepts numeric strings like pydantic did, but whole floats
+# such as 63.0 are still rejected for int fields.
+_input_decoder = msgspec.json.Decoder(HeartDiseaseInput, strict=False)
+_batch_decoder = msgspec.json.Decoder(List[HeartDiseaseInput], strict=False)
+
+# FastAPI cannot see msgspec types, so describe the bodies for the docs here
+_INPUT_SCHEMA = msgspec.json.schema_components([HeartDiseaseInput])[1]["HeartDiseaseInput"]
+
+def _request_body(schema):
+    """OpenAPI request body for a JSON payload with the given schema"""
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
+# msgspec reports errors as "<message> - at `$[0].age`"
+_ERROR_PATH = re.compile(r"^(.*?)(?: - at `\$(.*)`)?$", re.DOTALL)
+_PATH_PART = re.compile(r"\.(\w+)|\[(\d+)\]")
+_MISSING_FIELD = re.compile(r"^Object missing required field `(\w+)`$")
+
+def _error_detail(e):
+    """Describe a msgspec error as a FastAPI-style list of {type, loc, msg} entries"""
+    msg, path = _ERROR_PATH.match(str(e)).groups()
+    loc = ["body"] + [name or int(index) for name, index in _PATH_PART.findall(path or "")]
+    if not isinstance(e, msgspec.ValidationError):
+        return [{"type": "json_invalid", "loc": loc, "msg": "JSON decode error", "ctx": {"error": msg}}]
+    missing = _MISSING_FIELD.match(msg)
+    if missing:
+        return [{"type": "missing", "loc": loc + [missing.group(1)], "msg": "Field required"}]
+    return [{"type": "value_error", "loc": loc, "msg": msg}]
+
+def _decode(decoder, body):
+    """Decode a request body, turning invalid input into a 422"""
+    try:
+        return decoder.decode(body)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=_error_detail(e))
+
 # Define the prediction response model
 class HeartDiseasePrediction(BaseModel):
     prediction: int  # 0 = no heart disease, 1 = heart disease
@@ -49,18 +408,34 @@ class ModelInfo(BaseModel):
     features: List[str]
     description: str
 
+# Constant responses, encoded once instead of on every request
+_ROOT_BYTES = orjson.dumps({
+    "message": "Heart Disease Prediction API",
+    "version": "1.0.0",
+    "endpoints": {
+        "/predict": "POST - Make heart disease prediction",
+        "/model-info": "GET - Get model information",
+        "/cache-stats": "GET - Prediction cache statistics",
+        "/health": "GET - Health check"
+    }
+})
+
+_MODEL_INFO_BYTES = orjson.dumps(ModelInfo(
+    model_type="Logistic Regression",
+    accuracy=0.8852,  # From your notebook results
+    features=list(FEATURES),
+    description="Logistic Regression model trained on UCI Heart Disease dataset with 88.52% accuracy"
+).model_dump())
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
-    return {
-        "message": "Heart Disease Prediction API",
-        "version": "1.0.0",
-        "endpoints": {
-            "/predict": "POST - Make heart disease prediction",
-            "/model-info": "GET - Get model information",
-            "/health": "GET - Health check"
-        }
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
+@lru_cache(maxsize=1)
+def _timestamp(second):
+    """ISO 8601 UTC timestamp for a Unix second, reused until the second changes"""
+    return datetime.fromtimestamp(second, timezone.utc).isoformat()
 
 @app.get("/health")
 async def health_check():
@@ -68,7 +443,17 @@ async def health_check():
     return {
         "status": "healthy",
         "model_loaded": model is not None,
-        "timestamp": pd.Timestamp.now().isoformat()
+        "timestamp": _timestamp(int(time.time()))
+    }
+
+@app.get("/cache-stats")
+async def cache_stats():
+    """Get hit/miss statistics for this worker process's /predict cache"""
+    return {
+        "hits": _cache_hits,
+        "misses": _cache_misses,
+        "maxsize": CACHE_SIZE,
+        "currsize": len(_cache)
     }
 
 @app.get("/model-info", response_model=ModelInfo)
@@ -77,72 +462,111 @@ async def get_model_info():
     if model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
-    return ModelInfo(
-        model_type="Logistic Regression",
-        accuracy=0.8852,  # From your notebook results
-        features=[
-            "age", "sex", "cp", "trestbps", "chol", "fbs", "restecg",
-            "thalach", "exang", "oldpeak", "slope", "ca", "thal"
-        ],
-        description="Logistic Regression model trained on UCI Heart Disease dataset with 88.52% accuracy"
-    )
+    return Response(content=_MODEL_INFO_BYTES, media_type="application/json")
 
-@app.post("/predict", response_model=HeartDiseasePrediction)
-async def predict_heart_disease(input_data: HeartDiseaseInput):
+@app.post("/predict", response_model=HeartDiseasePrediction,
+          openapi_extra=_request_body(_INPUT_SCHEMA))
+async def predict_heart_disease(request: Request):
     """Predict heart disease based on patient features"""
     if model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
+    input_data = _decode(_input_decoder, await request.body())
+    
+    if _worker is None or _worker.done():
+        raise HTTPException(status_code=503, detail="Prediction worker not running")
+    
     try:
-        # Convert input to DataFrame
-        input_df = pd.DataFrame([input_data.dict()])
-        
-        # Make prediction
-        prediction = model.predict(input_df)[0]
-        probability = model.predict_proba(input_df)[0][1]  # Probability of heart disease
-        
-        # Determine confidence level
-        if probability > 0.8:
-            confidence = "High"
-        elif probability > 0.6:
-            confidence = "Medium"
-        else:
-            confidence = "Low"
+        key = _features_key(input_data)
+        result = _cache_get(key)
+        if result is None:
+            # Queue the request and wait for the batch worker to score it
+            future = asyncio.get_running_loop().create_future()
+            await _queue.put((key, future))
+            result = await future
+        prediction, probability, confidence = result  # probability of heart disease
         
         return HeartDiseasePrediction(
-            prediction=int(prediction),
-            probability=float(probability),
-            confidence=confidence
+            prediction=prediction,
+            probability=probability,
+            confidence=CONFIDENCE_LABELS[confidence]
         )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
-@app.post("/predict-batch")
-async def predict_batch(input_data: List[HeartDiseaseInput]):
+@app.post("/predict-batch",
+          openapi_extra=_request_body({"type": "array", "items": _INPUT_SCHEMA}))
+async def predict_batch(request: Request):
     """Predict heart disease for multiple patients"""
     if model is None:
         raise HTTPException(status_code=503, detail="Model not loaded")
     
+    body = await request.body()
+    
+    # Clients that accept NDJSON get one line per patient as chunks are scored
+    if _wants_ndjson(request):
+        # The first chunk is scored before any headers go out, so failures
+        # there still get a proper error status
+        input_data, first = await run_in_threadpool(_start_stream, body)
+        return StreamingResponse(_stream_batch(input_data, first), media_type="application/x-ndjson")
+    
+    # Decoding and scoring are CPU-bound, keep them off the event loop
+    return await run_in_threadpool(_predict_batch, body)
+
+def _parse_accept(header):
+    """Map each media type in an Accept header to its q value"""
+    accepted = {}
+    for item in header.split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name.lower()] = q
+    return accepted
+
+def _wants_ndjson(request):
+    """Whether the client explicitly asks for NDJSON at least as much as JSON"""
+    accepted = _parse_accept(request.headers.get("accept", ""))
+    ndjson_q = accepted.get("application/x-ndjson", 0.0)
+    json_q = accepted.get("application/json", accepted.get("application/*", accepted.get("*/*", 0.0)))
+    return ndjson_q > 0 and ndjson_q >= json_q
+
+# Patients scored per NDJSON chunk
+STREAM_CHUNK = 1024
+
+def _batch_results(input_data, first_id):
+    """Score a list of inputs and format one result dict per patient, numbered from first_id"""
+    predictions, probabilities, confidences = _score(_features_matrix(input_data))
+    
+    # Use plain Python ints/floats for the encoder
+    return [
+        {
+            "patient_id": i,
+            "prediction": pred,
+            "probability": prob,
+            "confidence": conf
+        }
+        for i, pred, prob, conf in zip(
+            range(first_id, first_id + len(input_data)),
+            predictions.tolist(),
+            probabilities.tolist(),
+            _CONFIDENCE_ARRAY[confidences].tolist()
+        )
+    ]
+
+def _predict_batch(body):
+    """Decode a batch request body and score it"""
+    input_data = _decode(_batch_decoder, body)
+    
     try:
-        # Convert list of inputs to DataFrame
-        input_list = [data.dict() for data in input_data]
-        input_df = pd.DataFrame(input_list)
-        
-        # Make predictions
-        predictions = model.predict(input_df)
-        probabilities = model.predict_proba(input_df)[:, 1]
-        
-        # Format results
-        results = []
-        for i, (pred, prob) in enumerate(zip(predictions, probabilities)):
-            confidence = "High" if prob > 0.8 else "Medium" if prob > 0.6 else "Low"
-            results.append({
-                "patient_id": i + 1,
-                "prediction": int(pred),
-                "probability": float(prob),
-                "confidence": confidence
-            })
+        results = _batch_results(input_data, 1)
         
         return {
             "predictions": results,
@@ -152,5 +576,41 @@ async def predict_batch(input_data: List[HeartDiseaseInput]):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
 
+def _ndjson_chunk(input_data, start):
+    """Score the STREAM_CHUNK patients from start on as NDJSON lines"""
+    results = _batch_results(input_data[start:start + STREAM_CHUNK], start + 1)
+    return b"".join(orjson.dumps(r, option=orjson.OPT_APPEND_NEWLINE) for r in results)
+
+def _start_stream(body):
+    """Decode a batch request body and score its first NDJSON chunk"""
+    input_data = _decode(_batch_decoder, body)
+    
+    try:
+        return input_data, _ndjson_chunk(input_data, 0)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
+
+def _stream_batch(input_data, first):
+    """Yield the first chunk, then score and yield the rest STREAM_CHUNK patients at a time"""
+    # A sync generator, so Starlette runs each step in the threadpool
+    yield first
+    for start in range(STREAM_CHUNK, len(input_data), STREAM_CHUNK):
+        try:
+            chunk = _ndjson_chunk(input_data, start)
+        except Exception as e:
+            # The 200 status is already sent, so report the failure as a final line
+            yield orjson.dumps({"error": f"Batch prediction error: {str(e)}"}, option=orjson.OPT_APPEND_NEWLINE)
+            return
+        yield chunk
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=WORKERS,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning"
+    ) 
\ No newline at end of file
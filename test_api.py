@@ -1,15 +1,22 @@
 import requests
+import httpx
+import asyncio
 import json
+import random
 import time
 
 # API base URL
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive session shared by all tests
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+
 def test_health_check():
     """Test the health check endpoint"""
     print("Testing health check...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         if response.status_code == 200:
             print("✅ Health check passed")
             print(f"Response: {response.json()}")
@@ -22,7 +29,7 @@ def test_model_info():
     """Test the model info endpoint"""
     print("\nTesting model info...")
     try:
-        response = requests.get(f"{BASE_URL}/model-info")
+        response = SESSION.get(f"{BASE_URL}/model-info")
         if response.status_code == 200:
             print("✅ Model info retrieved successfully")
             info = response.json()
@@ -56,7 +63,7 @@ def test_single_prediction():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/predict", json=patient_data)
+        response = SESSION.post(f"{BASE_URL}/predict", json=patient_data)
         if response.status_code == 200:
             print("✅ Single prediction successful")
             result = response.json()
@@ -123,7 +130,7 @@ def test_batch_prediction():
     ]
     
     try:
-        response = requests.post(f"{BASE_URL}/predict-batch", json=batch_data)
+        response = SESSION.post(f"{BASE_URL}/predict-batch", json=batch_data)
         if response.status_code == 200:
             print("✅ Batch prediction successful")
             result = response.json()
@@ -138,11 +145,89 @@ def test_batch_prediction():
     except Exception as e:
         print(f"❌ Batch prediction error: {e}")
 
+def test_streaming_batch_prediction():
+    """Test the batch prediction endpoint with NDJSON streaming"""
+    print("\nTesting streaming batch prediction...")
+    
+    patient_data = {
+        "age": 63,
+        "sex": 1,
+        "cp": 3,
+        "trestbps": 145,
+        "chol": 233,
+        "fbs": 1,
+        "restecg": 0,
+        "thalach": 150,
+        "exang": 0,
+        "oldpeak": 2.3,
+        "slope": 0,
+        "ca": 0,
+        "thal": 1
+    }
+    
+    try:
+        response = SESSION.post(f"{BASE_URL}/predict-batch", json=[patient_data] * 3,
+                                headers={"Accept": "application/x-ndjson"}, stream=True)
+        if response.status_code == 200:
+            results = [json.loads(line) for line in response.iter_lines() if line]
+            print(f"✅ Streaming batch prediction successful: {len(results)} lines")
+            for pred in results:
+                print(f"Patient {pred['patient_id']}: {pred['prediction']} "
+                      f"- Probability: {pred['probability']:.3f}, Confidence: {pred['confidence']}")
+        else:
+            print(f"❌ Streaming batch prediction failed with status {response.status_code}")
+            print(f"Error: {response.text}")
+    except Exception as e:
+        print(f"❌ Streaming batch prediction error: {e}")
+
+async def _post_concurrently(path, payloads):
+    """POST all payloads at once over a single client"""
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        return await asyncio.gather(*(client.post(path, json=p) for p in payloads))
+
+def test_concurrent_predictions():
+    """Test many simultaneous single predictions"""
+    print("\nTesting concurrent predictions...")
+    
+    # Random patients, so that even on a rerun most requests miss the
+    # server's prediction cache and are actually scored
+    patients = [
+        {
+            "age": random.randint(29, 77),
+            "sex": random.randint(0, 1),
+            "cp": random.randint(0, 3),
+            "trestbps": random.randint(94, 200),
+            "chol": random.randint(126, 564),
+            "fbs": random.randint(0, 1),
+            "restecg": random.randint(0, 2),
+            "thalach": random.randint(71, 202),
+            "exang": random.randint(0, 1),
+            "oldpeak": round(random.uniform(0.0, 6.2), 1),
+            "slope": random.randint(0, 2),
+            "ca": random.randint(0, 4),
+            "thal": random.randint(0, 3)
+        }
+        for _ in range(49)
+    ]
+    
+    try:
+        start = time.perf_counter()
+        responses = asyncio.run(_post_concurrently("/predict", patients))
+        elapsed = time.perf_counter() - start
+        failed = [r for r in responses if r.status_code != 200]
+        if not failed:
+            print(f"✅ {len(responses)} concurrent predictions successful in {elapsed:.3f}s")
+        else:
+            print(f"❌ {len(failed)} of {len(responses)} concurrent predictions failed")
+            print(f"Error: {failed[0].text}")
+    except Exception as e:
+        print(f"❌ Concurrent predictions error: {e}")
+
 def test_root_endpoint():
     """Test the root endpoint"""
     print("\nTesting root endpoint...")
     try:
-        response = requests.get(BASE_URL)
+        response = SESSION.get(BASE_URL)
         if response.status_code == 200:
             print("✅ Root endpoint working")
             print(f"Response: {response.json()}")
@@ -164,6 +249,8 @@ def main():
     test_model_info()
     test_single_prediction()
     test_batch_prediction()
+    test_streaming_batch_prediction()
+    test_concurrent_predictions()
     
     print("\n" + "=" * 50)
     print("🏁 API Tests Completed!")